@@ -9,6 +9,7 @@ Author: Rouhat Abdullah
 Date: December 2025
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import sys
@@ -16,103 +17,182 @@ from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
-from data_processing import categorize_result
+from data_processing import (AB_RE, AGE_COL, CATEGORY_COLS, SYSTEM_COLS, coerce_age,
+                             load_amr_data)
 
+RESULT_CATEGORIES = ['Resistant', 'Sensitive', 'Intermediate']
 
-def main():
-    """Main data cleaning pipeline."""
 
-    print("="*70)
-    print("ANTIMICROBIAL RESISTANCE DATA CLEANING PIPELINE")
-    print("="*70)
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--engine', choices=['pandas', 'polars'], default='pandas',
+                        help='DataFrame library used to load and categorize the raw data')
+    parser.add_argument('--emit-csv', action='store_true',
+                        help='also write CSV copies of the cleaned data and summary')
+    return parser.parse_args()
 
-    # Set paths
-    raw_data_path = Path('data/raw/amr_data_2025.xlsx')
-    processed_dir = Path('data/processed')
-    processed_dir.mkdir(exist_ok=True)
 
-    # Load raw data
+def load_and_categorize(raw_data_path):
+    """Load raw data and add categorized result columns with pandas."""
+    # Load raw data, skipping system metadata columns at parse time
     print(f"\n[1/5] Loading raw data from {raw_data_path}...")
-    df = pd.read_excel(raw_data_path)
+    df = load_amr_data(raw_data_path)
     print(f"      Loaded {len(df)} records with {df.shape[1]} columns")
 
-    # Remove system columns
-    print("\n[2/5] Removing system metadata columns...")
-    system_cols = ['_id', '_uuid', '_submission_time', '_validation_status',
-                   '_notes', '_status', '_submitted_by', '__version__', '_tags', '_index']
-    df = df.drop(columns=system_cols, errors='ignore')
-    print(f"      Retained {df.shape[1]} columns")
+    print("\n[2/5] System metadata columns skipped at parse time")
 
     # Identify antibiotic columns
     print("\n[3/5] Identifying antibiotic susceptibility columns...")
-    antibiotic_cols = [col for col in df.columns if ' - ' in col or
-                      col.startswith('NET_') or col.startswith('MET_')]
+    antibiotic_cols = df.columns[df.columns.str.contains(AB_RE)].tolist()
     print(f"      Found {len(antibiotic_cols)} antibiotic columns")
 
     # Standardize resistance categories
     print("\n[4/5] Standardizing resistance categories (R/S/I)...")
-    def categorize(result):
-        if pd.isna(result):
-            return np.nan
-        result_str = str(result).upper()
-        if 'R' in result_str:
-            return 'Resistant'
-        elif 'S' in result_str:
-            return 'Sensitive'
-        elif 'I' in result_str:
-            return 'Intermediate'
-        return np.nan
-
-    for col in antibiotic_cols:
-        df[col + '_Cat'] = df[col].apply(categorize)
+    # Stack every antibiotic column into one Series so the string checks run
+    # as a handful of vectorized passes instead of a Python call per cell
+    stacked = df[antibiotic_cols].astype('string').stack().dropna()
+    upper = stacked.str.upper()
+    categories = np.select(
+        [
+            upper.str.contains('R', regex=False).to_numpy(dtype=bool),
+            upper.str.contains('S', regex=False).to_numpy(dtype=bool),
+            upper.str.contains('I', regex=False).to_numpy(dtype=bool),
+        ],
+        ['Resistant', 'Sensitive', 'Intermediate'],
+        default=None
+    )
+    cat_df = (pd.Series(categories, index=stacked.index)
+              .unstack()
+              .reindex(index=df.index, columns=antibiotic_cols))
+    # Categorical codes make the repeated equality masks and counts below
+    # integer compares rather than per-cell string compares
+    df = df.join(cat_df.add_suffix('_Cat').astype(pd.CategoricalDtype(RESULT_CATEGORIES)))
 
     print(f"      Created {len(antibiotic_cols)} categorized columns")
 
-    # Calculate resistance rates
-    print("\n[5/5] Calculating resistance rate summary...")
-    resistance_data = []
+    return df, antibiotic_cols
+
+
+def load_and_categorize_polars(raw_data_path):
+    """Load raw data and add categorized result columns with Polars."""
+    import polars as pl
+
+    print(f"\n[1/5] Loading raw data from {raw_data_path} (polars)...")
+    # Pin the columns calamine would otherwise infer differently from pandas
+    raw = pl.read_excel(raw_data_path, engine='calamine',
+                        schema_overrides={'Record Number': pl.Float64,
+                                          'Sample Collection Date': pl.Datetime('us')})
+    print(f"      Loaded {raw.height} records with {raw.width} columns")
+
+    print("\n[2/5] Removing system metadata columns...")
+    lf = (raw.lazy()
+          .drop(SYSTEM_COLS, strict=False)
+          .with_columns(pl.col(AGE_COL).cast(pl.Float64, strict=False),
+                        pl.col(CATEGORY_COLS).cast(pl.Categorical)))
+    columns = lf.collect_schema().names()
+    print(f"      Retained {len(columns)} columns")
+
+    print("\n[3/5] Identifying antibiotic susceptibility columns...")
+    antibiotic_cols = [col for col in columns if AB_RE.search(col)]
+    print(f"      Found {len(antibiotic_cols)} antibiotic columns")
+
+    print("\n[4/5] Standardizing resistance categories (R/S/I)...")
+    result_dtype = pl.Enum(RESULT_CATEGORIES)
+
+    def categorize(col):
+        upper = pl.col(col).cast(pl.String).str.to_uppercase()
+        return (pl.when(upper.str.contains('R', literal=True)).then(pl.lit('Resistant'))
+                .when(upper.str.contains('S', literal=True)).then(pl.lit('Sensitive'))
+                .when(upper.str.contains('I', literal=True)).then(pl.lit('Intermediate'))
+                .otherwise(None)
+                .cast(result_dtype)
+                .alias(col + '_Cat'))
+
+    pl_df = lf.with_columns([categorize(col) for col in antibiotic_cols]).collect(engine='streaming')
+    print(f"      Created {len(antibiotic_cols)} categorized columns")
 
-    for col in antibiotic_cols:
-        cat_col = col + '_Cat'
-        total = df[cat_col].notna().sum()
+    # Hand over to pandas with the same dtypes the pandas engine produces:
+    # Enum converts to an ordered categorical and nullable ints to float
+    df = pl_df.to_pandas()
+    cat_cols = [col + '_Cat' for col in antibiotic_cols]
+    df[cat_cols] = df[cat_cols].astype(pd.CategoricalDtype(RESULT_CATEGORIES))
+    df[AGE_COL] = coerce_age(df[AGE_COL])
 
-        if total < 30:  # Minimum sample size
-            continue
+    return df, antibiotic_cols
 
-        resistant = (df[cat_col] == 'Resistant').sum()
-        sensitive = (df[cat_col] == 'Sensitive').sum()
-        intermediate = (df[cat_col] == 'Intermediate').sum()
 
-        resistance_rate = (resistant / total) * 100
-        sensitivity_rate = (sensitive / total) * 100
+def main():
+    """Main data cleaning pipeline."""
+    args = parse_args()
+
+    print("="*70)
+    print("ANTIMICROBIAL RESISTANCE DATA CLEANING PIPELINE")
+    print("="*70)
 
-        ab_name = col.split(' - ')[1] if ' - ' in col else col.replace('_', ' ')
+    # Set paths
+    raw_data_path = Path('data/raw/amr_data_2025.xlsx')
+    processed_dir = Path('data/processed')
+    processed_dir.mkdir(exist_ok=True)
 
-        resistance_data.append({
-            'Antibiotic': ab_name,
-            'Total_Tests': total,
-            'Resistant': resistant,
-            'Sensitive': sensitive,
-            'Intermediate': intermediate,
-            'Resistance_Rate': resistance_rate,
-            'Sensitivity_Rate': sensitivity_rate
-        })
+    if args.engine == 'polars':
+        df, antibiotic_cols = load_and_categorize_polars(raw_data_path)
+    else:
+        df, antibiotic_cols = load_and_categorize(raw_data_path)
 
-    resistance_df = pd.DataFrame(resistance_data).sort_values('Resistance_Rate', ascending=False)
+    # Calculate resistance rates
+    print("\n[5/5] Calculating resistance rate summary...")
+    cat_cols = [col + '_Cat' for col in antibiotic_cols]
+    cat_block = df[cat_cols]
+
+    total = cat_block.notna().sum()
+    resistant = (cat_block == 'Resistant').sum()
+    sensitive = (cat_block == 'Sensitive').sum()
+    intermediate = (cat_block == 'Intermediate').sum()
+
+    ab_names = [col.split(' - ')[1] if ' - ' in col else col.replace('_', ' ')
+                for col in antibiotic_cols]
+
+    resistance_df = pd.concat(
+        [total, resistant, sensitive, intermediate,
+         resistant / total * 100, sensitive / total * 100],
+        axis=1,
+        keys=['Total_Tests', 'Resistant', 'Sensitive', 'Intermediate',
+              'Resistance_Rate', 'Sensitivity_Rate']
+    )
+    resistance_df.insert(0, 'Antibiotic', ab_names)
+
+    # Minimum sample size
+    resistance_df = (resistance_df[resistance_df['Total_Tests'] >= 30]
+                     .reset_index(drop=True)
+                     .sort_values('Resistance_Rate', ascending=False, kind='stable'))
+    count_cols = ['Total_Tests', 'Resistant', 'Sensitive', 'Intermediate']
+    resistance_df[count_cols] = resistance_df[count_cols].apply(pd.to_numeric, downcast='integer')
 
     # Export cleaned datasets
     print("\n" + "="*70)
     print("EXPORTING CLEANED DATA")
     print("="*70)
 
-    output_file = processed_dir / 'amr_data_2025_cleaned.csv'
-    df.to_csv(output_file, index=False)
+    # CSV copies for the notebooks and other text-based consumers; written
+    # before the Parquet files so readers that pick the newer copy use Parquet
+    if args.emit_csv:
+        csv_file = processed_dir / 'amr_data_2025_cleaned.csv'
+        df.to_csv(csv_file, index=False)
+        summary_csv = processed_dir / 'resistance_rates_summary.csv'
+        resistance_df.to_csv(summary_csv, index=False)
+        print(f"✓ CSV exports: {csv_file}, {summary_csv}")
+
+    output_file = processed_dir / 'amr_data_2025_cleaned.parquet'
+    df.to_parquet(output_file, engine='pyarrow', compression='zstd',
+                  use_dictionary=True)
     print(f"✓ Cleaned dataset: {output_file}")
     print(f"  Records: {len(df)}")
     print(f"  Columns: {df.shape[1]}")
 
-    summary_file = processed_dir / 'resistance_rates_summary.csv'
-    resistance_df.to_csv(summary_file, index=False)
+    summary_file = processed_dir / 'resistance_rates_summary.parquet'
+    resistance_df.to_parquet(summary_file, engine='pyarrow', compression='zstd',
+                             index=False)
     print(f"\n✓ Resistance summary: {summary_file}")
     print(f"  Antibiotics analyzed: {len(resistance_df)}")
 
@@ -125,6 +205,10 @@ def main():
     missing_pct = (df.isnull().sum().sum() / (len(df) * df.shape[1])) * 100
     print(f"Overall missing data: {missing_pct:.1f}%")
 
+    # Memory footprint
+    memory_mb = df.memory_usage(deep=True).sum() / 1024**2
+    print(f"In-memory size: {memory_mb:.2f} MB")
+
     # Age validation
     valid_ages = df[df['Age (years)'] >= 0]['Age (years)']
     print(f"Valid age records: {len(valid_ages)}/{len(df)} ({len(valid_ages)/len(df)*100:.1f}%)")
@@ -140,14 +224,11 @@ def main():
         print(f"  {org}: {count} ({count/len(df)*100:.1f}%)")
 
     # Overall resistance
-    all_results = []
-    for col in antibiotic_cols:
-        results = df[col + '_Cat'].dropna()
-        all_results.extend(results.tolist())
-
-    overall_dist = pd.Series(all_results).value_counts()
-    total_tests = len(all_results)
-    overall_resistance = (overall_dist.get('Resistant', 0) / total_tests * 100)
+    overall_dist = pd.Series({'Resistant': resistant.sum(),
+                              'Sensitive': sensitive.sum(),
+                              'Intermediate': intermediate.sum()})
+    total_tests = total.sum()
+    overall_resistance = (overall_dist['Resistant'] / total_tests * 100)
 
     print(f"\n" + "="*70)
     print(f"OVERALL RESISTANCE RATE: {overall_resistance:.1f}%")
@@ -25,6 +25,28 @@ sns.set_style('whitegrid')
 sns.set_palette('Set2')
 plt.rcParams['figure.dpi'] = 300
 
+# Faster Agg rasterization of long paths
+matplotlib.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
+
+
+def load_processed(data_dir, name, columns):
+    """Load a processed table from whichever of its Parquet/CSV copies is newer.
+
+    The notebooks still rewrite the CSVs, so a Parquet file is only used
+    when it is at least as recent as the CSV next to it.
+    """
+    parquet_path = data_dir / f'{name}.parquet'
+    csv_path = data_dir / f'{name}.csv'
+    if parquet_path.exists():
+        if not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            return pd.read_parquet(parquet_path, columns=columns)
+        print(f"      Note: {csv_path} is newer than {parquet_path.name}; loading the CSV")
+    return pd.read_csv(csv_path, usecols=columns)
+
 
 def main():
     """Generate all analysis visualizations."""
@@ -39,8 +61,10 @@ def main():
     figures_dir.mkdir(parents=True, exist_ok=True)
 
     print("\n[1/4] Loading processed data...")
-    df = pd.read_csv(data_dir / 'amr_data_2025_cleaned.csv')
-    resistance_df = pd.read_csv(data_dir / 'resistance_rates_summary.csv')
+    df = load_processed(data_dir, 'amr_data_2025_cleaned', ['Organism Identified'])
+    resistance_df = load_processed(data_dir, 'resistance_rates_summary',
+                                   ['Antibiotic', 'Total_Tests', 'Resistance_Rate',
+                                    'Sensitivity_Rate'])
     print(f"      Loaded {len(df)} isolates, {len(resistance_df)} antibiotics")
 
     # 1. Resistance rates visualization
@@ -48,8 +72,8 @@ def main():
     top_20 = resistance_df.head(20)
 
     fig, ax = plt.subplots(figsize=(12, 10))
-    colors = ['#d62728' if x >= 80 else '#ff7f0e' if x >= 50 else '#2ca02c'
-              for x in top_20['Resistance_Rate']]
+    rates = top_20['Resistance_Rate'].to_numpy()
+    colors = np.select([rates >= 80, rates >= 50], ['#d62728', '#ff7f0e'], default='#2ca02c')
 
     bars = ax.barh(range(len(top_20)), top_20['Resistance_Rate'],
                    color=colors, alpha=0.7)
@@ -60,9 +84,9 @@ def main():
                 fontsize=14, fontweight='bold')
     ax.invert_yaxis()
 
-    for i, (rate, n) in enumerate(zip(top_20['Resistance_Rate'],
-                                     top_20['Total_Tests'])):
-        ax.text(rate + 2, i, f'{rate:.1f}% (n={n})', va='center', fontsize=9)
+    labels = [f'{rate:.1f}% (n={n})' for rate, n in zip(top_20['Resistance_Rate'],
+                                                       top_20['Total_Tests'])]
+    ax.bar_label(bars, labels=labels, padding=3, fontsize=9)
 
     ax.axvline(50, color='orange', linestyle='--', alpha=0.5, linewidth=2)
     ax.axvline(80, color='red', linestyle='--', alpha=0.5, linewidth=2)
@@ -85,9 +109,9 @@ def main():
                 fontsize=14, fontweight='bold')
     ax.invert_yaxis()
 
-    for i, v in enumerate(organisms.values):
-        pct = v/organisms.sum()*100
-        ax.text(v + 1, i, f'{v} ({pct:.1f}%)', va='center', fontsize=10)
+    pcts = organisms.values / organisms.sum() * 100
+    labels = [f'{v} ({pct:.1f}%)' for v, pct in zip(organisms.values, pcts)]
+    ax.bar_label(bars, labels=labels, padding=3, fontsize=10)
 
     plt.tight_layout()
     output_file = figures_dir / 'organism_distribution.png'
@@ -97,7 +121,7 @@ def main():
 
     # 3. Best antibiotics (highest sensitivity)
     print("\n[4/4] Generating sensitivity analysis plot...")
-    best_abs = resistance_df.sort_values('Sensitivity_Rate', ascending=False).head(15)
+    best_abs = resistance_df.sort_values('Sensitivity_Rate', ascending=False, kind='stable').head(15)
 
     fig, ax = plt.subplots(figsize=(12, 8))
     bars = ax.barh(range(len(best_abs)), best_abs['Sensitivity_Rate'],
@@ -109,10 +133,10 @@ def main():
                 fontsize=14, fontweight='bold')
     ax.invert_yaxis()
 
-    for i, (rate, n) in enumerate(zip(best_abs['Sensitivity_Rate'],
-                                     best_abs['Total_Tests'])):
-        ax.text(rate - 3, i, f'{rate:.1f}%', va='center', ha='right',
-               fontsize=9, color='white', fontweight='bold')
+    labels = [f'{rate:.1f}%' for rate in best_abs['Sensitivity_Rate']]
+    texts = ax.bar_label(bars, labels=labels, padding=-3, fontsize=9,
+                         color='white', fontweight='bold')
+    plt.setp(texts, ha='right')
 
     ax.axvline(80, color='darkgreen', linestyle='--', alpha=0.7,
               linewidth=2, label='80% threshold')
@@ -22,7 +22,7 @@ fi
 
 # Check if required packages are installed
 echo "[INFO] Checking dependencies..."
-python3 -c "import pandas, numpy, matplotlib, seaborn" 2>/dev/null || {
+python3 -c "import pandas, numpy, matplotlib, seaborn, pyarrow" 2>/dev/null || {
     echo "[ERROR] Required packages not installed."
     echo "[INFO] Installing dependencies..."
     pip install -r requirements.txt
@@ -35,7 +35,7 @@ echo ""
 echo "========================================================================"
 echo "STEP 1: DATA CLEANING"
 echo "========================================================================"
-python3 scripts/01_clean_data.py
+python3 scripts/01_clean_data.py --emit-csv
 
 if [ $? -eq 0 ]; then
     echo ""
@@ -67,8 +67,8 @@ echo "  PIPELINE COMPLETED SUCCESSFULLY"
 echo "========================================================================"
 echo ""
 echo "Output files:"
-echo "  - data/processed/amr_data_2025_cleaned.csv"
-echo "  - data/processed/resistance_rates_summary.csv"
+echo "  - data/processed/amr_data_2025_cleaned.parquet (+ .csv)"
+echo "  - data/processed/resistance_rates_summary.parquet (+ .csv)"
 echo "  - reports/figures/*.png"
 echo ""
 echo "Next steps:"
@@ -7,6 +7,44 @@ import numpy as np
 from scipy import stats
 
 
+def result_flag_cols(result_col):
+    """Names of the resistant/sensitive flag columns derived from ``result_col``."""
+    return f'_is_res__{result_col}', f'_is_sens__{result_col}'
+
+
+def attach_result_flags(df, result_col='result'):
+    """
+    Add int8 resistant/sensitive flag columns for reuse across analyses.
+
+    The flags are named after their source column (see ``result_flag_cols``),
+    and the analysis functions reuse them only when called with that same
+    ``result_col``. Re-attach the flags after modifying ``result_col``.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        AMR data, modified in place
+    result_col : str
+        Column name for test results
+
+    Returns:
+    --------
+    pd.DataFrame
+        The same dataframe with the two flag columns added
+    """
+    res_flag, sens_flag = result_flag_cols(result_col)
+    df[res_flag] = df[result_col].eq('Resistant').astype('int8')
+    df[sens_flag] = df[result_col].eq('Sensitive').astype('int8')
+    return df
+
+
+def _with_result_flags(df, result_col):
+    """Return ``df`` with flags for ``result_col``, computed on a shallow copy if missing."""
+    if all(col in df.columns for col in result_flag_cols(result_col)):
+        return df
+    return attach_result_flags(df.copy(deep=False), result_col)
+
+
 def compare_resistance_rates(df1, df2, antibiotic_col, result_col, label1='2024', label2='2025'):
     """
     Compare resistance rates between two time periods.
@@ -28,21 +66,22 @@ def compare_resistance_rates(df1, df2, antibiotic_col, result_col, label1='2024'
         Comparison of resistance rates
     """
     def calc_rate(df):
-        resistant = df[df[result_col] == 'Resistant'].groupby(antibiotic_col).size()
-        total = df.groupby(antibiotic_col).size()
-        return (resistant / total * 100).fillna(0)
+        res_flag, _ = result_flag_cols(result_col)
+        grouped = (_with_result_flags(df, result_col)
+                   .groupby(antibiotic_col, observed=True, sort=False)[res_flag])
+        return grouped.sum().div(grouped.size()).mul(100).fillna(0)
 
-    rates1 = calc_rate(df1)
-    rates2 = calc_rate(df2)
+    rates1, rates2 = calc_rate(df1).align(calc_rate(df2))
+    change = rates2 - rates1
 
     comparison = pd.DataFrame({
         f'{label1}_rate': rates1,
         f'{label2}_rate': rates2,
-        'change': rates2 - rates1,
-        'pct_change': ((rates2 - rates1) / rates1 * 100).replace([np.inf, -np.inf], np.nan)
+        'change': change,
+        'pct_change': np.where(rates1 > 0, change / rates1 * 100, np.nan)
     })
 
-    return comparison.sort_values('change', ascending=False)
+    return comparison.sort_index().sort_values('change', ascending=False, kind='stable')
 
 
 def analyze_age_resistance(df, age_col, result_col, organism_col=None):
@@ -65,9 +104,10 @@ def analyze_age_resistance(df, age_col, result_col, organism_col=None):
     pd.DataFrame
         Resistance rates by age group
     """
-    age_analysis = df.groupby(age_col)[result_col].apply(
-        lambda x: (x == 'Resistant').sum() / len(x) * 100
-    ).sort_index()
+    res_flag, _ = result_flag_cols(result_col)
+    grouped = (_with_result_flags(df, result_col)
+               .groupby(age_col, observed=True, sort=False)[res_flag])
+    age_analysis = (grouped.sum() / grouped.size() * 100).sort_index()
 
     return pd.DataFrame({
         'age_group': age_analysis.index,
@@ -94,28 +134,24 @@ def calculate_effectiveness_score(df, antibiotic_col, result_col):
     pd.DataFrame
         Effectiveness scores
     """
-    grouped = df.groupby(antibiotic_col)
-
-    results = []
-    for antibiotic, group in grouped:
-        total = len(group)
-        sensitive = (group[result_col] == 'Sensitive').sum()
-        resistant = (group[result_col] == 'Resistant').sum()
-
-        sensitivity_rate = (sensitive / total * 100) if total > 0 else 0
-
-        # Effectiveness score: weighted by sample size and sensitivity
-        # Higher score = more effective
-        effectiveness = sensitivity_rate * np.log1p(total)
-
-        results.append({
-            'antibiotic': antibiotic,
-            'sensitivity_rate': sensitivity_rate,
-            'total_tests': total,
-            'effectiveness_score': effectiveness
-        })
+    _, sens_flag = result_flag_cols(result_col)
+    counts = (_with_result_flags(df, result_col)
+              .groupby(antibiotic_col, observed=True, sort=False)
+              .agg(total_tests=(result_col, 'size'), sensitive=(sens_flag, 'sum')))
+
+    sensitivity_rate = counts['sensitive'] / counts['total_tests'] * 100
+
+    # Effectiveness score: weighted by sample size and sensitivity
+    # Higher score = more effective
+    results = pd.DataFrame({
+        'antibiotic': counts.index,
+        'sensitivity_rate': sensitivity_rate.values,
+        'total_tests': counts['total_tests'].values,
+        'effectiveness_score': (sensitivity_rate * np.log1p(counts['total_tests'])).values
+    })
 
-    return pd.DataFrame(results).sort_values('effectiveness_score', ascending=False)
+    return (results.sort_values('antibiotic')
+            .sort_values('effectiveness_score', ascending=False, kind='stable'))
 
 
 def identify_first_line_treatments(df, antibiotic_col, result_col,
@@ -141,26 +177,24 @@ def identify_first_line_treatments(df, antibiotic_col, result_col,
     pd.DataFrame
         Recommended first-line antibiotics
     """
-    grouped = df.groupby(antibiotic_col)
-
-    recommendations = []
-    for antibiotic, group in grouped:
-        total = len(group)
-        if total < min_samples:
-            continue
-
-        sensitive = (group[result_col] == 'Sensitive').sum()
-        sensitivity_rate = (sensitive / total * 100)
-
-        if sensitivity_rate >= sensitivity_threshold:
-            recommendations.append({
-                'antibiotic': antibiotic,
-                'sensitivity_rate': sensitivity_rate,
-                'total_tests': total,
-                'recommendation': 'First-line'
-            })
+    _, sens_flag = result_flag_cols(result_col)
+    counts = (_with_result_flags(df, result_col)
+              .groupby(antibiotic_col, observed=True, sort=False)
+              .agg(total_tests=(result_col, 'size'), sensitive=(sens_flag, 'sum')))
+    counts['sensitivity_rate'] = counts['sensitive'] / counts['total_tests'] * 100
+
+    eligible = counts.query('total_tests >= @min_samples and '
+                            'sensitivity_rate >= @sensitivity_threshold')
+
+    recommendations = pd.DataFrame({
+        'antibiotic': eligible.index,
+        'sensitivity_rate': eligible['sensitivity_rate'].values,
+        'total_tests': eligible['total_tests'].values,
+        'recommendation': 'First-line'
+    })
 
-    return pd.DataFrame(recommendations).sort_values('sensitivity_rate', ascending=False)
+    return (recommendations.sort_values('antibiotic')
+            .sort_values('sensitivity_rate', ascending=False, kind='stable'))
 
 
 def gram_classification_analysis(df, organism_col, gram_col, result_col):
@@ -183,20 +217,10 @@ def gram_classification_analysis(df, organism_col, gram_col, result_col):
     dict
         Analysis results for both groups
     """
-    analysis = {}
-
-    for gram_type in df[gram_col].unique():
-        if pd.isna(gram_type):
-            continue
-
-        subset = df[df[gram_col] == gram_type]
-        total = len(subset)
-        resistant = (subset[result_col] == 'Resistant').sum()
-
-        analysis[gram_type] = {
-            'total_tests': total,
-            'resistant_count': resistant,
-            'resistance_rate': (resistant / total * 100) if total > 0 else 0
-        }
+    res_flag, _ = result_flag_cols(result_col)
+    counts = (_with_result_flags(df, result_col)
+              .groupby(gram_col, observed=True, sort=False)
+              .agg(total_tests=(result_col, 'size'), resistant_count=(res_flag, 'sum')))
+    counts['resistance_rate'] = counts['resistant_count'] / counts['total_tests'] * 100
 
-    return analysis
+    return counts.to_dict(orient='index')
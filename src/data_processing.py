@@ -2,15 +2,52 @@
 Data processing utilities for antimicrobial resistance analysis.
 """
 
+import re
+import string
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Survey export metadata columns, not part of the analysis data
+SYSTEM_COLS = {'_id', '_uuid', '_submission_time', '_validation_status',
+               '_notes', '_status', '_submitted_by', '__version__', '_tags', '_index'}
+
+# Antibiotic susceptibility columns: "CODE - Name" plus the NET_/MET_ exports
+AB_RE = re.compile(r' - |^NET_|^MET_')
+
+# Lowercases ASCII letters and turns spaces into underscores in one pass
+_COL_NAME_TABLE = str.maketrans({' ': '_', **{c: c.lower() for c in string.ascii_uppercase}})
+
+# Low-cardinality text columns, stored as categoricals
+CATEGORY_COLS = ['Gender', 'Sample Type', 'Site (if swab)', 'Growth Result',
+                 'Organism Identified']
+
+# Known column types, declared up front to skip inference on load
+LOAD_DTYPES = dict.fromkeys(CATEGORY_COLS, 'category')
+
+# Free-text in exports; coerced after load rather than cast strictly on read
+AGE_COL = 'Age (years)'
+
 
 def load_amr_data(filepath):
     """
     Load antimicrobial resistance data from Excel file.
 
+    Uses the Rust-backed calamine reader when ``python-calamine`` is
+    installed, otherwise openpyxl. System metadata columns are skipped
+    at parse time.
+
     Parameters:
     -----------
     filepath : str or Path
@@ -21,32 +58,79 @@ def load_amr_data(filepath):
     pd.DataFrame
         Loaded and initially processed data
     """
-    df = pd.read_excel(filepath)
+    df = pd.read_excel(
+        filepath,
+        engine=EXCEL_ENGINE,
+        usecols=lambda col: col not in SYSTEM_COLS,
+        dtype=LOAD_DTYPES
+    )
+    if AGE_COL in df.columns:
+        df[AGE_COL] = coerce_age(df[AGE_COL])
     return df
 
 
-def clean_data(df):
+def coerce_age(ages):
+    """
+    Convert ages to numbers, narrowing to Int16 only when nothing is lost.
+
+    Unparseable values become missing. Fractional ages (e.g. infants in
+    months) keep the column as float.
+
+    Parameters:
+    -----------
+    ages : pd.Series
+        Raw age values
+
+    Returns:
+    --------
+    pd.Series
+        Numeric ages (Int16 if all values are whole and in range, else float)
+    """
+    ages = pd.to_numeric(ages, errors='coerce')
+    known = ages.dropna()
+    info = np.iinfo(np.int16)
+    if (known % 1 == 0).all() and known.between(info.min, info.max).all():
+        return ages.astype('Int16')
+    return ages
+
+
+def _norm_col(name):
+    """Standardize a column name (lowercase, spaces replaced with underscores)."""
+    name = str(name)
+    if name.isascii():
+        return name.translate(_COL_NAME_TABLE)
+    # Full Unicode case mapping (e.g. 'Ç' -> 'ç', context-dependent final sigma)
+    return name.lower().replace(' ', '_')
+
+
+def clean_data(df, inplace=False):
     """
     Clean and standardize the AMR dataset.
 
+    Without ``inplace`` the caller's frame is left untouched: ``dropna``
+    already returns a new object, so no up-front full copy is made.
+
     Parameters:
     -----------
     df : pd.DataFrame
         Raw dataframe
+    inplace : bool
+        Modify ``df`` directly instead of returning a new frame
 
     Returns:
     --------
     pd.DataFrame
-        Cleaned dataframe
+        Cleaned dataframe (``df`` itself when ``inplace`` is True)
     """
-    # Make a copy to avoid modifying original
-    df_clean = df.copy()
-
     # Remove completely empty rows
-    df_clean = df_clean.dropna(how='all')
+    if inplace:
+        df_clean = df
+        df_clean.dropna(how='all', inplace=True)
+    else:
+        df_clean = df.dropna(how='all')
 
     # Standardize column names (lowercase, replace spaces with underscores)
-    df_clean.columns = df_clean.columns.str.lower().str.replace(' ', '_')
+    df_clean.columns = [_norm_col(col) for col in df_clean.columns]
 
     return df_clean
 
@@ -80,6 +164,105 @@ def categorize_resistance(result):
         return 'Unknown'
 
 
+def categorize_series(results):
+    """
+    Vectorized variant of ``categorize_resistance`` for a whole Series.
+
+    Parameters:
+    -----------
+    results : pd.Series
+        Resistance test results (R, S, I, etc.)
+
+    Returns:
+    --------
+    pd.Series
+        Standardized categories, aligned to the input index
+    """
+    normalized = results.astype('string').str.upper().str.strip()
+
+    categories = np.select(
+        [
+            normalized.isin(['R', 'RESISTANT']).to_numpy(dtype=bool),
+            normalized.isin(['S', 'SENSITIVE', 'SUSCEPTIBLE']).to_numpy(dtype=bool),
+            normalized.isin(['I', 'INTERMEDIATE']).to_numpy(dtype=bool),
+        ],
+        ['Resistant', 'Sensitive', 'Intermediate'],
+        default='Unknown'
+    )
+
+    return pd.Series(categories, index=results.index, name=results.name)
+
+
+# Codes returned by the compiled categorizer, indexing into RESULT_CODE_CATEGORIES
+RESULT_CODE_CATEGORIES = ['Unknown', 'Resistant', 'Sensitive', 'Intermediate']
+
+_RESULT_TOKENS = {
+    b'R': 1, b'RESISTANT': 1,
+    b'S': 2, b'SENSITIVE': 2, b'SUSCEPTIBLE': 2,
+    b'I': 3, b'INTERMEDIATE': 3,
+}
+_TOKEN_WIDTH = max(len(token) for token in _RESULT_TOKENS)
+_TOKEN_BYTES = np.zeros((len(_RESULT_TOKENS), _TOKEN_WIDTH), dtype=np.uint8)
+_TOKEN_LENGTHS = np.zeros(len(_RESULT_TOKENS), dtype=np.int64)
+_TOKEN_CODES = np.zeros(len(_RESULT_TOKENS), dtype=np.int8)
+for _i, (_token, _code) in enumerate(_RESULT_TOKENS.items()):
+    _TOKEN_BYTES[_i, :len(_token)] = np.frombuffer(_token, dtype=np.uint8)
+    _TOKEN_LENGTHS[_i] = len(_token)
+    _TOKEN_CODES[_i] = _code
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _categorize_arr(values, token_bytes, token_lengths, token_codes):
+        """Match NUL-padded, uppercased byte rows against the result tokens."""
+        n_rows, width = values.shape
+        codes = np.zeros(n_rows, dtype=np.int8)
+        for i in range(n_rows):
+            length = width
+            while length > 0 and values[i, length - 1] == 0:
+                length -= 1
+            for t in range(token_lengths.shape[0]):
+                if token_lengths[t] != length:
+                    continue
+                matched = True
+                for j in range(length):
+                    if values[i, j] != token_bytes[t, j]:
+                        matched = False
+                        break
+                if matched:
+                    codes[i] = token_codes[t]
+                    break
+        return codes
+
+
+def categorize_array(results):
+    """
+    Compiled bulk variant of ``categorize_resistance``.
+
+    Falls back to ``categorize_series`` when numba is not installed.
+
+    Parameters:
+    -----------
+    results : array-like
+        Resistance test results (R, S, I, etc.), possibly of mixed types
+
+    Returns:
+    --------
+    pd.Categorical
+        Standardized categories with RESULT_CODE_CATEGORIES as categories
+    """
+    normalized = pd.Series(results).astype('string').str.upper().str.strip()
+
+    if numba is None:
+        return pd.Categorical(categorize_series(normalized),
+                              categories=RESULT_CODE_CATEGORIES)
+
+    encoded = np.char.encode(normalized.fillna('').to_numpy(dtype=str), 'utf-8')
+    values = encoded.view(np.uint8).reshape(len(encoded), encoded.dtype.itemsize)
+    codes = _categorize_arr(values, _TOKEN_BYTES, _TOKEN_LENGTHS, _TOKEN_CODES)
+
+    return pd.Categorical.from_codes(codes, categories=RESULT_CODE_CATEGORIES)
+
+
 def calculate_resistance_rate(df, antibiotic_col, result_col):
     """
     Calculate resistance rate for each antibiotic.
@@ -99,7 +282,11 @@ def calculate_resistance_rate(df, antibiotic_col, result_col):
         Resistance rates by antibiotic
     """
     # Group by antibiotic and count results
-    resistance_summary = df.groupby([antibiotic_col, result_col]).size().unstack(fill_value=0)
+    resistance_summary = (df.groupby([antibiotic_col, result_col], observed=True, sort=False)
+                          .size()
+                          .unstack(fill_value=0)
+                          .sort_index()
+                          .sort_index(axis=1))
 
     # Calculate rates
     if 'Resistant' in resistance_summary.columns:
@@ -133,17 +320,18 @@ def identify_mdr_organisms(df, organism_col, antibiotic_col, result_col, thresho
     pd.DataFrame
         Organisms with their resistance counts
     """
-    # Filter for resistant results
-    resistant_df = df[df[result_col] == 'Resistant']
-
     # Count resistant antibiotics per organism
-    mdr_counts = resistant_df.groupby(organism_col)[antibiotic_col].nunique()
+    resistant_df = df.loc[df[result_col].eq('Resistant')]
+    mdr_counts = resistant_df.groupby(organism_col, observed=True, sort=False)[antibiotic_col].nunique()
 
     # Identify MDR organisms
-    mdr_organisms = mdr_counts[mdr_counts >= threshold].sort_values(ascending=False)
+    mdr_organisms = (mdr_counts[mdr_counts >= threshold]
+                     .sort_index()
+                     .sort_values(ascending=False, kind='stable'))
+    counts = mdr_organisms.to_numpy()
 
     return pd.DataFrame({
         'organism': mdr_organisms.index,
-        'resistant_antibiotics_count': mdr_organisms.values,
-        'mdr_status': ['MDR' if x >= threshold else 'Non-MDR' for x in mdr_organisms.values]
+        'resistant_antibiotics_count': counts,
+        'mdr_status': np.where(counts >= threshold, 'MDR', 'Non-MDR')
     })
@@ -37,8 +37,8 @@ def plot_resistance_rates(df, antibiotic_col='antibiotic', rate_col='resistance_
     bars = ax.barh(df_sorted[antibiotic_col], df_sorted[rate_col])
 
     # Color bars by resistance level
-    colors = ['green' if x < 20 else 'yellow' if x < 50 else 'red'
-              for x in df_sorted[rate_col]]
+    rates = df_sorted[rate_col].to_numpy()
+    colors = np.select([rates < 20, rates < 50], ['green', 'yellow'], default='red')
     for bar, color in zip(bars, colors):
         bar.set_color(color)
         bar.set_alpha(0.7)
@@ -49,8 +49,7 @@ def plot_resistance_rates(df, antibiotic_col='antibiotic', rate_col='resistance_
     ax.invert_yaxis()
 
     # Add value labels
-    for i, v in enumerate(df_sorted[rate_col]):
-        ax.text(v + 1, i, f'{v:.1f}%', va='center')
+    ax.bar_label(bars, labels=[f'{v:.1f}%' for v in df_sorted[rate_col]], padding=3)
 
     plt.tight_layout()
     return fig
@@ -77,7 +76,7 @@ def plot_organism_resistance(df, organism_col, count_col, top_n=10,
     df_sorted = df.nlargest(top_n, count_col)
 
     fig, ax = plt.subplots(figsize=(12, 8))
-    ax.barh(df_sorted[organism_col], df_sorted[count_col], color='coral', alpha=0.7)
+    bars = ax.barh(df_sorted[organism_col], df_sorted[count_col], color='coral', alpha=0.7)
 
     ax.set_xlabel('Number of Resistant Antibiotics', fontsize=12)
     ax.set_ylabel('Organism', fontsize=12)
@@ -85,8 +84,7 @@ def plot_organism_resistance(df, organism_col, count_col, top_n=10,
     ax.invert_yaxis()
 
     # Add value labels
-    for i, v in enumerate(df_sorted[count_col]):
-        ax.text(v + 0.2, i, str(int(v)), va='center')
+    ax.bar_label(bars, labels=[str(int(v)) for v in df_sorted[count_col]], padding=3)
 
     plt.tight_layout()
     return fig
@@ -125,7 +123,7 @@ def plot_temporal_comparison(comparison_df, title='Resistance Rate Changes Over
 
     # Plot 2: Change in resistance
     if 'change' in comparison_df.columns:
-        colors = ['red' if x > 0 else 'green' for x in comparison_df['change']]
+        colors = np.where(comparison_df['change'].to_numpy() > 0, 'red', 'green')
         ax2.barh(comparison_df.index, comparison_df['change'], color=colors, alpha=0.7)
         ax2.set_xlabel('Change in Resistance Rate (%)', fontsize=12)
         ax2.set_ylabel('Antibiotic', fontsize=12)